@@ -1,11 +1,42 @@
-from fastapi import FastAPI, File, UploadFile, Form
-from fastapi.responses import HTMLResponse
+from fastapi import FastAPI, File, UploadFile, Form, Request, HTTPException
+from fastapi.responses import HTMLResponse, Response, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.concurrency import run_in_threadpool
 import pandas as pd
+import numpy as np
+import openpyxl
+import json
+import logging
+import os
+import gzip
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import NamedTuple
+from contextlib import asynccontextmanager
 from io import BytesIO
+from itertools import islice
 from datetime import datetime
 
-app = FastAPI()
+try:
+    import brotli
+except ImportError:  # brotli yoksa yalnızca gzip sunulur
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+@asynccontextmanager
+async def lifespan(app):
+    # PDF kütüphaneleri eksikse uygulama çalışmaya devam eder; yalnızca PDF düğmesi uyarı verir
+    eksik = [ad for ad in PDF_KUTUPHANELERI if ad not in STATIK_URL]
+    if eksik:
+        logger.warning(
+            "static/ altında eksik PDF kütüphaneleri: %s (bkz. static/vendor/README.md); "
+            "raporlarda PDF dışa aktarımı çalışmayacak.", ", ".join(eksik)
+        )
+    yield
+
+app = FastAPI(lifespan=lifespan)
 
 # CORS ayarları (HTML'den veri gönderebilmek için)
 app.add_middleware(
@@ -16,528 +47,486 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-@app.get("/", response_class=HTMLResponse)
-async def read_root():
-    return """
-    <html>
-    <head>
-        <title>Satış Analiz Uygulaması</title>
-        <meta charset="utf-8" />
-        <link href="https://fonts.googleapis.com/css2?family=Montserrat:wght@400;600&display=swap" rel="stylesheet">
-        <style>
-            body { font-family:'Montserrat',sans-serif; background:#f7f7f8; color:#05111E; padding:40px; }
-            h2 { text-align:center; margin-bottom: 20px; }
-            form { background:#fff; padding:20px; border-radius:12px; box-shadow:0 8px 24px rgba(0,0,0,.06); max-width: 1000px; margin: 0 auto 16px; }
-            .row { display:flex; gap:16px; flex-wrap:wrap; align-items:center; }
-            .row > * { flex: 1 1 220px; }
-            input[type="file"], input[type="date"], button { width:100%; padding:10px 12px; border:1px solid #e5e7eb; border-radius:10px; }
-            button { background:#111827; color:#fff; border:none; cursor:pointer; }
-            button:hover { opacity:.9; }
-            .table-wrap { background:#fff; padding:20px; border-radius:12px; box-shadow:0 8px 24px rgba(0,0,0,.06); overflow:auto; max-width: 1000px; margin: 0 auto; }
-            table { width:100%; border-collapse: collapse; }
-            th, td { padding:12px 14px; border-bottom:1px solid #eef0f3; text-align:left; vertical-align: middle; }
-            th { background:#f3f4f6; font-weight:600; }
-            .right { text-align:right; }
-            .btn-mini { padding:8px 12px; border-radius:8px; background:#2563eb; color:#fff; border:none; cursor:pointer; }
-            .btn-mini:hover { opacity:.9; }
-            .muted { color:#6b7280; font-size: 14px; margin: 12px 0; }
-            .rate-input { width: 90px; padding:6px 8px; border:1px solid #e5e7eb; border-radius:8px; }
-            .controls { display:flex; gap:8px; align-items:center; justify-content:flex-end; margin-bottom:10px; }
-            .controls input { width: 100px; padding:6px 8px; border:1px solid #e5e7eb; border-radius:8px; }
-            .pill { background:#f3f4f6; padding:6px 10px; border-radius:999px; font-size:12px; }
-            .summary { display:flex; justify-content:flex-end; margin-top:12px; }
-            .summary .pill strong { font-weight:700; }
-        </style>
-    </head>
-    <body>
-        <h2>Excel Satış Analizi (Türkçe Arayüz)</h2>
-        <form id="upload-form" enctype="multipart/form-data">
-            <div class="row">
-                <div>
-                    <label>Excel Dosyası</label>
-                    <input type="file" name="file" accept=".xlsx,.xls">
-                </div>
-                <div>
-                    <label>Başlangıç Tarihi</label>
-                    <input type="date" name="start_date">
-                </div>
-                <div>
-                    <label>Bitiş Tarihi</label>
-                    <input type="date" name="end_date">
-                </div>
-                <div style="flex:0 0 160px">
-                    <label>&nbsp;</label>
-                    <button type="submit">Hesapla</button>
-                </div>
+# Statik dosyalar (CSS/JS ve yerel PDF kütüphaneleri) başlangıçta bir kez okunur,
+# içerik özetli adlarla sunulur ve gzip/brotli olarak önceden sıkıştırılır.
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static")
+STATIC_CACHE_CONTROL = "public, max-age=31536000, immutable"
+PDF_KUTUPHANELERI = ("vendor/jspdf.umd.min.js", "vendor/jspdf.plugin.autotable.min.js")
+MEDIA_TYPES = {
+    ".css": "text/css; charset=utf-8",
+    ".js": "application/javascript; charset=utf-8",
+}
+
+def sikistir(icerik):
+    surumler = {"identity": icerik, "gzip": gzip.compress(icerik, compresslevel=9, mtime=0)}
+    if brotli is not None:
+        surumler["br"] = brotli.compress(icerik, quality=11)
+    return surumler
+
+def statik_varliklari_yukle(klasor=STATIC_DIR):
+    urls, dosyalar = {}, {}
+    for kok, _, adlar in os.walk(klasor):
+        for ad in sorted(adlar):
+            kok_ad, uzanti = os.path.splitext(ad)
+            if uzanti not in MEDIA_TYPES:
+                continue
+            yol = os.path.join(kok, ad)
+            with open(yol, "rb") as f:
+                icerik = f.read()
+            ozet = hashlib.sha256(icerik).hexdigest()[:12]
+            goreli = os.path.relpath(yol, klasor).replace(os.sep, "/")
+            surumlu = f"{kok_ad}.{ozet}{uzanti}"
+            urls[goreli] = f"/static/{surumlu}"
+            dosyalar[surumlu] = (MEDIA_TYPES[uzanti], sikistir(icerik), ozet)
+    return urls, dosyalar
+
+STATIK_URL, STATIK_DOSYALAR = statik_varliklari_yukle()
+
+def kodlama_agirliklari(baslik):
+    # Accept-Encoding -> {kodlama: q}; q=0 açık bir reddir ve "*" ile geçersiz kılınamaz
+    agirliklar = {}
+    for parca in baslik.split(","):
+        ad, *parametreler = [x.strip() for x in parca.split(";")]
+        q = 1.0
+        for prm in parametreler:
+            anahtar, _, deger = prm.partition("=")
+            if anahtar.strip().lower() == "q":
+                try:
+                    q = float(deger)
+                except ValueError:
+                    q = 0.0
+        if ad:
+            agirliklar[ad.lower()] = q
+    return agirliklar
+
+def kodlama_kabul_ediliyor(agirliklar, kodlama):
+    return agirliklar.get(kodlama, agirliklar.get("*", 0.0)) > 0
+
+def etag_eslesiyor(baslik, etag):
+    # If-None-Match liste ve W/ önekli etiketler içerebilir (zayıf karşılaştırma)
+    if baslik.strip() == "*":
+        return True
+    return etag in {e.strip().removeprefix("W/") for e in baslik.split(",")}
+
+def sikistirilmis_yanit(request, media_type, surumler, ozet, cache_control):
+    agirliklar = kodlama_agirliklari(request.headers.get("accept-encoding", ""))
+    kodlama = next((k for k in ("br", "gzip") if kodlama_kabul_ediliyor(agirliklar, k) and k in surumler), "identity")
+    # Güçlü doğrulayıcı her kodlama için ayrı olmalı
+    etag = f'"{ozet}-{kodlama}"'
+    headers = {"Cache-Control": cache_control, "ETag": etag, "Vary": "Accept-Encoding"}
+
+    if etag_eslesiyor(request.headers.get("if-none-match", ""), etag):
+        return Response(status_code=304, headers=headers)
+
+    if kodlama != "identity":
+        headers["Content-Encoding"] = kodlama
+    return Response(content=surumler[kodlama], media_type=media_type, headers=headers)
+
+@app.get("/static/{ad}")
+async def statik(ad: str, request: Request):
+    varlik = STATIK_DOSYALAR.get(ad)
+    if varlik is None:
+        raise HTTPException(status_code=404)
+    media_type, surumler, ozet = varlik
+    return sikistirilmis_yanit(request, media_type, surumler, ozet, STATIC_CACHE_CONTROL)
+
+ANA_SAYFA_HTML = f"""<!DOCTYPE html>
+<html>
+<head>
+    <title>Satış Analiz Uygulaması</title>
+    <meta charset="utf-8" />
+    <link rel="stylesheet" href="{STATIK_URL['app.css']}">
+</head>
+<body>
+    <h2>Excel Satış Analizi (Türkçe Arayüz)</h2>
+    <form id="upload-form" enctype="multipart/form-data">
+        <div class="row">
+            <div>
+                <label>Excel Dosyası</label>
+                <input type="file" name="file" accept=".xlsx,.xls">
+            </div>
+            <div>
+                <label>Başlangıç Tarihi</label>
+                <input type="date" name="start_date">
+            </div>
+            <div>
+                <label>Bitiş Tarihi</label>
+                <input type="date" name="end_date">
+            </div>
+            <div style="flex:0 0 160px">
+                <label>&nbsp;</label>
+                <button type="submit">Hesapla</button>
             </div>
-        </form>
-
-        <div class="table-wrap" id="result">
-            <p class="muted">Sonuçlar burada görünecek.</p>
         </div>
+    </form>
 
-        <script>
-        const form = document.getElementById("upload-form");
-        const resultEl = document.getElementById("result");
-        const fmt = (n) => (Number(n) || 0).toLocaleString('tr-TR', { minimumFractionDigits: 2, maximumFractionDigits: 2 });
-
-        function recalcSummary() {
-            // Tüm satırların oran * toplam tutarlarının toplamını hesapla
-            let sum = 0;
-            resultEl.querySelectorAll("tr[data-ders]").forEach(row => {
-                const toplam = Number(row.dataset.toplam) || 0;
-                const oran = Number(row.querySelector(".rate-input").value) || 0;
-                sum += toplam * (oran/100);
-            });
-            const el = resultEl.querySelector("#telif-toplam");
-            if (el) el.textContent = fmt(sum);
-        }
-
-        form.onsubmit = async (e) => {
-            e.preventDefault();
-            const formData = new FormData(form);
-
-            if (!formData.get("file") || !formData.get("start_date") || !formData.get("end_date")) {
-                resultEl.innerHTML = "<p>Lütfen dosya ve tarihleri seçin.</p>";
-                return;
-            }
-
-            try {
-                const res = await fetch("/analiz", { method: "POST", body: formData });
-                if (!res.ok) throw new Error("İstek başarısız: " + res.status);
-                const data = await res.json();
-
-                // Varsayılan oran
-                const defaultRate = 20;
-
-                let html = `
-                    <div class="controls">
-                        <span class="pill">Genel Toplam: <strong>${fmt(data.total)}</strong> TL</span>
-                        <label>Varsayılan Oran (%)</label>
-                        <input type="number" id="global-rate" min="0" max="1000" step="0.01" value="${defaultRate}">
-                        <button id="apply-rate" class="btn-mini" type="button">Uygula</button>
-                    </div>
-                    <table>
-                        <thead>
-                            <tr>
-                                <th>📘 Ders</th>
-                                <th class="right">Toplam Satış (TL)</th>
-                                <th class="right">% Oran → Tutar (TL)</th>
-                                <th>İşlem</th>
-                            </tr>
-                        </thead>
-                        <tbody>
-                `;
-
-                for (const item of data.detaylar) {
-                    const toplam = Number(item.tutar) || 0;
-                    const oran = defaultRate;
-                    const tutarYuzde = toplam * (oran/100);
-                    const ders = (item.ders ?? "").toString().replace(/"/g, '&quot;');
-                    html += `
-                        <tr data-ders="${ders}" data-toplam="${toplam}">
-                            <td>${ders}</td>
-                            <td class="right toplam">${fmt(toplam)}</td>
-                            <td class="right">
-                                <input class="rate-input" type="number" min="0" max="1000" step="0.01" value="${oran}"> %
-                                &rarr; <span class="rate-amount">${fmt(tutarYuzde)}</span>
-                            </td>
-                            <td><button class="btn-mini hesapla-btn" data-ders="${ders}">Hesapla</button></td>
-                        </tr>
-                    `;
-                }
-
-                html += `
-                        </tbody>
-                    </table>
-                    <div class="summary">
-                        <span class="pill">Toplam Telif Tutarı: <strong id="telif-toplam">${fmt( data.detaylar.reduce((acc,i)=>acc+(Number(i.tutar)||0)*(defaultRate/100), 0 ) )}</strong> TL</span>
-                    </div>
-                `;
-
-                resultEl.innerHTML = html;
-
-                // Satır bazında oran değişiminde hesapla + özet güncelle
-                resultEl.querySelectorAll("input.rate-input").forEach(inp => {
-                    inp.addEventListener("input", () => {
-                        const row = inp.closest("tr");
-                        const toplam = Number(row.dataset.toplam) || 0;
-                        let oran = Number(inp.value);
-                        if (!isFinite(oran)) oran = 0;
-                        if (oran < 0) oran = 0;
-                        const tutar = toplam * (oran/100);
-                        row.querySelector(".rate-amount").textContent = fmt(tutar);
-                        recalcSummary();
-                    });
-                });
-
-                // Global oran uygula
-                const applyBtn = resultEl.querySelector("#apply-rate");
-                applyBtn.addEventListener("click", () => {
-                    const globalRate = Number(resultEl.querySelector("#global-rate").value) || 0;
-                    resultEl.querySelectorAll("tr[data-ders] .rate-input").forEach(inp => {
-                        inp.value = globalRate;
-                        inp.dispatchEvent(new Event("input"));
-                    });
-                    recalcSummary();
-                });
-
-                // "Hesapla" -> yeni sekmede aylık döküm aç
-                resultEl.querySelectorAll(".hesapla-btn").forEach(btn => {
-                    btn.addEventListener("click", (ev) => {
-                        ev.preventDefault();
-
-                        const row = btn.closest("tr");
-                        const ders = btn.getAttribute("data-ders");
-                        const oran = Number(row.querySelector(".rate-input").value) || 0;
-
-                        // Aynı dosya + tarihleri tekrar göndererek yeni sekmede açıyoruz
-                        const tempForm = document.createElement("form");
-                        tempForm.method = "POST";
-                        tempForm.enctype = "multipart/form-data";
-                        tempForm.action = "/aylik-dokum";
-                        tempForm.target = "_blank";
-
-                        // Orijinal formdaki alanları kopyala
-                        const fd = new FormData(form);
-                        for (const [k,v] of fd.entries()) {
-                            if (v instanceof File) {
-                                const fileInput = document.createElement("input");
-                                fileInput.type = "file";
-                                fileInput.name = k;
-                                // Not: File nesnesini programatik olarak yeniden set etmek mümkün değil.
-                                // Bunun için aşağıdaki workaround: mevcut input elementini klonlayıp forma ekleyelim.
-                                // Basit yol: doğrudan orijinal input'u formun içine taşıyıp sonra geri koymak.
-                            }
-                        }
-
-                        // Pratik çözüm: gizli inputlar ile tarihleri ve ders/oranı ekleyip,
-                        // dosya input'unu da DOM'dan kopyalayıp bu forma clone ederek ekleyeceğiz.
-                        // (Tarayıcılar programatik File set etmeye izin vermez.)
-                        const originalFileInput = form.querySelector('input[type="file"][name="file"]');
-                        if (!originalFileInput || !originalFileInput.files || originalFileInput.files.length === 0) {
-                            alert("Lütfen dosyayı yeniden seçin.");
-                            return;
-                        }
-
-                        // Yeni form içine bir file input kopyası koy
-                        const fileClone = originalFileInput.cloneNode();
-                        // Kullanıcı etkileşimi olmadan File listesini aktaramayız; bu yüzden
-                        // yeni bir FormData üzerinden submit gerekiyor. Bunun için iframe/target
-                        // yaklaşımında file'ı yeniden seçmek gerekir. Basit ve çalışır yöntem:
-                        // Geçici bir form yaratıp orijinal input'u bu forma move et, submit et, sonra geri koy.
-                        const placeholder = document.createElement("span");
-                        originalFileInput.parentNode.insertBefore(placeholder, originalFileInput);
-                        tempForm.appendChild(originalFileInput); // inputu geçici forma taşı
-                        
-                        // Diğer alanlar
-                        const addHidden = (name, value) => {
-                            const inp = document.createElement("input");
-                            inp.type = "hidden";
-                            inp.name = name;
-                            inp.value = value;
-                            tempForm.appendChild(inp);
-                        };
-                        addHidden("start_date", form.querySelector('input[name="start_date"]').value);
-                        addHidden("end_date", form.querySelector('input[name="end_date"]').value);
-                        addHidden("ders", ders);
-                        addHidden("rate", oran.toString());
-
-                        document.body.appendChild(tempForm);
-                        tempForm.submit();
-
-                        // File input'u eski yerine geri koy
-                        placeholder.parentNode.insertBefore(originalFileInput, placeholder);
-                        placeholder.remove();
-                        tempForm.remove();
-                    });
-                });
-
-            } catch (err) {
-                console.error(err);
-                resultEl.innerHTML = "<p>Bir hata oluştu. Lütfen dosya sütunlarını ve tarih aralığını kontrol edin.</p>";
-            }
-        };
-        </script>
-    </body>
-    </html>
-    """
+    <div class="table-wrap" id="result">
+        <p class="muted">Sonuçlar burada görünecek.</p>
+    </div>
+
+    <script src="{STATIK_URL['app.js']}"></script>
+</body>
+</html>
+"""
+ANA_SAYFA = sikistir(ANA_SAYFA_HTML.encode("utf-8"))
+ANA_SAYFA_OZETI = hashlib.sha256(ANA_SAYFA_HTML.encode("utf-8")).hexdigest()[:12]
+
+@app.get("/", response_class=HTMLResponse)
+async def read_root(request: Request):
+    # Sayfa iskeleti her istekte yeniden üretilmez; sürümlü olmadığı için ETag ile doğrulanır
+    return sikistirilmis_yanit(request, "text/html; charset=utf-8", ANA_SAYFA, ANA_SAYFA_OZETI, "no-cache")
+
+# Yüklenen dosyalar bir kez ayrıştırılıp sıkıştırılmış biçimde saklanır; aynı dosyayla
+# gelen sonraki istekler (ör. her "Hesapla" dökümü) Excel'i yeniden okumaz.
+VERI_ONBELLEK_BOYUTU = 8
+_veri_onbellegi = OrderedDict()
+_onbellek_kilidi = threading.Lock()
+
+class SatisVerisi(NamedTuple):
+    # Satırlar (ders kodu, tarih) sırasındadır: her ders ofsetler[k]:ofsetler[k+1] aralığında
+    # tarihe göre sıralı durur, böylece ders + tarih aralığı sorguları dilimlemeye dönüşür.
+    # Son kod (len(dersler)) adı boş satırlar içindir; yalnızca genel toplama girer.
+    dersler: tuple        # kod -> ders adı
+    ders_kodlari: dict    # str(ders adı) -> kodlar (1 ile "1" ayrı kodlardır, aynı metne düşer)
+    kodlar: np.ndarray    # int32
+    tarihler: np.ndarray  # int64 (ns)
+    tutarlar: np.ndarray  # float64, boş tutarlar 0
+    ofsetler: np.ndarray  # int64, len(dersler) + 2
+
+def veri_olustur(df):
+    tarih = pd.to_datetime(df['Tarih'], errors='coerce')
+    gecerli = tarih.notna().to_numpy()
+    tarihler = tarih.to_numpy(dtype='datetime64[ns]')[gecerli].view(np.int64)
+    tutarlar = np.nan_to_num(pd.to_numeric(df['Tutar'], errors='coerce').to_numpy(dtype=np.float64)[gecerli])
+    kodlar, adlar = pd.factorize(df['Ders'].to_numpy()[gecerli], sort=True)
+    kodlar = np.where(kodlar < 0, len(adlar), kodlar).astype(np.int32)
+
+    sira = np.lexsort((tarihler, kodlar))
+    kodlar, tarihler, tutarlar = kodlar[sira], tarihler[sira], tutarlar[sira]
+    dersler = tuple(ad.item() if hasattr(ad, "item") else ad for ad in adlar)
+    ders_kodlari = {}
+    for kod, ad in enumerate(dersler):
+        ders_kodlari.setdefault(str(ad), []).append(kod)
+    return SatisVerisi(
+        dersler=dersler,
+        ders_kodlari={ad: tuple(k) for ad, k in ders_kodlari.items()},
+        kodlar=kodlar,
+        tarihler=tarihler,
+        tutarlar=tutarlar,
+        ofsetler=np.searchsorted(kodlar, np.arange(len(dersler) + 2)),
+    )
+
+SATIS_SUTUNLARI = ['Tarih', 'Ders', 'Tutar']
+
+def sutun_adi(ad):
+    # Başlıktaki baştaki/sondaki boşluklar yok sayılır ("Tarih " == "Tarih")
+    return str(ad).strip() if ad is not None else ""
+
+def ders_degeri(deger):
+    # pd.read_excel tam sayı değerli ondalıkları int'e çevirir; openpyxl satırları da aynı biçime getirilir
+    if isinstance(deger, float) and deger.is_integer():
+        return int(deger)
+    return deger
+
+def satis_sutunlari(df):
+    # Excel'den gelen çerçeveyi (pd.read_excel ya da önizlemenin openpyxl satırları) tek biçime getirir;
+    # önbellekteki veri hangi yoldan oluşturulursa oluşturulsun aynı olur
+    df = df.rename(columns=sutun_adi)[SATIS_SUTUNLARI]
+    return df.assign(Ders=df['Ders'].map(ders_degeri))
+
+def veri_yukle(contents):
+    anahtar = hashlib.sha256(contents).hexdigest()
+    veri = onbellekten_al(anahtar)
+    if veri is None:
+        df = pd.read_excel(BytesIO(contents))
+        veri = veri_olustur(satis_sutunlari(df))
+        onbellege_ekle(anahtar, veri)
+    return veri
+
+def onbellekten_al(anahtar):
+    with _onbellek_kilidi:
+        veri = _veri_onbellegi.get(anahtar)
+        if veri is not None:
+            _veri_onbellegi.move_to_end(anahtar)
+        return veri
+
+def onbellege_ekle(anahtar, veri):
+    with _onbellek_kilidi:
+        _veri_onbellegi[anahtar] = veri
+        _veri_onbellegi.move_to_end(anahtar)
+        while len(_veri_onbellegi) > VERI_ONBELLEK_BOYUTU:
+            _veri_onbellegi.popitem(last=False)
+
+def ders_araligi(veri, kod, start, end):
+    # Dersin [start, end] aralığındaki satırları: veri.*[i:j]
+    lo, hi = veri.ofsetler[kod], veri.ofsetler[kod + 1]
+    dilim = veri.tarihler[lo:hi]
+    i = lo + np.searchsorted(dilim, np.datetime64(start, 'ns').view(np.int64), side='left')
+    j = lo + np.searchsorted(dilim, np.datetime64(end, 'ns').view(np.int64), side='right')
+    return int(i), int(j)
+
+def tarih_araligi(veri):
+    if not len(veri.tarihler):
+        return {"ilk": None, "son": None}
+    gunler = veri.tarihler.view('datetime64[ns]').astype('datetime64[D]')
+    return {"ilk": str(gunler.min()), "son": str(gunler.max())}
 
 @app.post("/analiz")
 async def analiz(file: UploadFile = File(...), start_date: str = Form(...), end_date: str = Form(...)):
     contents = await file.read()
-    df = pd.read_excel(BytesIO(contents))
+    veri = await run_in_threadpool(veri_yukle, contents)
 
-    # Gerekli sütunların temizlenmesi
-    df = df[['Tarih', 'Ders', 'Tutar']]
-    df['Tarih'] = pd.to_datetime(df['Tarih'])
-
-    # Tarih filtreleme
     start = datetime.strptime(start_date, "%Y-%m-%d")
     end = datetime.strptime(end_date, "%Y-%m-%d")
-    mask = (df['Tarih'] >= start) & (df['Tarih'] <= end)
-    filtered = df.loc[mask]
-
-    total_sales = filtered['Tutar'].sum()
-    grouped = filtered.groupby('Ders')['Tutar'].sum().reset_index()
-    detaylar = grouped.to_dict(orient='records')
+    return analiz_sonucu(veri, start, end)
+
+def analiz_sonucu(veri, start, end, adet=False):
+    total_sales = 0.0
+    detaylar = []
+    for kod in range(len(veri.dersler) + 1):
+        i, j = ders_araligi(veri, kod, start, end)
+        tutar = float(veri.tutarlar[i:j].sum())
+        total_sales += tutar
+        if kod < len(veri.dersler) and j > i:
+            satir = {"ders": veri.dersler[kod], "tutar": tutar}
+            if adet:
+                satir["adet"] = j - i
+            detaylar.append(satir)
 
     return {
         "total": float(total_sales),
-        "detaylar": [{"ders": row['Ders'], "tutar": float(row['Tutar'])} for row in detaylar]
+        "detaylar": detaylar
     }
 
-@app.post("/aylik-dokum", response_class=HTMLResponse)
-async def aylik_dokum(
+# Önizleme akışında her adımda okunacak satır sayısı (istemci yalnızca bu sınırlar içinde değiştirebilir)
+ONIZLEME_PARCA_SATIR = 5000
+ONIZLEME_EN_AZ_PARCA = 1000
+ONIZLEME_EN_COK_PARCA = 100000
+
+@app.post("/analiz-onizleme")
+async def analiz_onizleme(
+    request: Request,
     file: UploadFile = File(...),
     start_date: str = Form(...),
     end_date: str = Form(...),
-    ders: str = Form(...),
-    rate: float = Form(...),
-    rates: str = Form(None)
+    parca_satir: int = Form(ONIZLEME_PARCA_SATIR)
 ):
     contents = await file.read()
-    df = pd.read_excel(BytesIO(contents))
-
-    df = df[['Tarih', 'Ders', 'Tutar']]
-    df['Tarih'] = pd.to_datetime(df['Tarih'], errors='coerce')
-    df = df.dropna(subset=['Tarih'])
     start = datetime.strptime(start_date, "%Y-%m-%d")
     end = datetime.strptime(end_date, "%Y-%m-%d")
-    base = df[(df['Tarih'] >= start) & (df['Tarih'] <= end)].copy()
-
-    try:
-        rates_map = json.loads(rates) if rates else {}
-    except Exception:
-        rates_map = {}
-
-    include_dersler = [str(ders)]
-    tum_dersler = sorted(set(base['Ders'][base['Ders'].astype(str).str.startswith('Tüm')].astype(str)))
-    include_dersler.extend([d for d in tum_dersler if d not in include_dersler])
-
-    monthly_frames = []
-    for dname in include_dersler:
-        sub = base[base['Ders'].astype(str) == dname].copy()
-        if sub.empty:
-            continue
-        sub['Ay'] = sub['Tarih'].dt.to_period('M').astype(str)
-        grp = (sub.groupby('Ay', as_index=False)
-                  .agg(Toplam=('Tutar','sum'), IslemAdedi=('Tutar','size')))
-        d_rate = float(rates_map.get(dname, rate))
-        grp['Ders'] = dname
-        grp['Oran'] = d_rate
-        monthly_frames.append(grp)
+    parca_satir = min(max(parca_satir, ONIZLEME_EN_AZ_PARCA), ONIZLEME_EN_COK_PARCA)
 
-    if not monthly_frames:
-        return HTMLResponse(content=wrap_html(
-            "<p style='font-family:Montserrat,sans-serif'>Seçilen aralıkta kayıt bulunamadı.</p>",
-            title="Aylık Döküm",
-            add_pdf_scripts=True
-        ))
+    anahtar = hashlib.sha256(contents).hexdigest()
 
-    monthly_all = pd.concat(monthly_frames, ignore_index=True).sort_values(['Ay','Ders'])
+    # Her satır bir JSON olayı: "onizleme" (ara tahmin), "sonuc" (kesin sonuç) veya "hata"
+    async def akis():
+        veri = onbellekten_al(anahtar)
+        if veri is not None:
+            yield olay(await run_in_threadpool(sonuc_olayi, veri, start, end))
+            return
 
-    def fmt(n):
         try:
-            return f"{float(n):,.2f}".replace(",", "X").replace(".", ",").replace("X", ".")
+            wb = await run_in_threadpool(openpyxl.load_workbook, BytesIO(contents), read_only=True, data_only=True)
         except Exception:
-            return "0,00"
-
-    rows_html = []
-    for _, row in monthly_all.iterrows():
-        rows_html.append(
-            f"<tr data-ay='{escape_html(row.Ay)}' "
-            f"data-ders='{escape_html(row.Ders)}' "
-            f"data-toplam='{float(row.Toplam):.6f}'>"
-            f"<td>{escape_html(row.Ay)}</td>"
-            f"<td>{escape_html(row.Ders)}</td>"
-            f"<td class='right'>{fmt(row.Toplam)}</td>"
-            f"<td class='right'>{int(row.IslemAdedi)}</td>"
-            f"<td class='right'>"
-            f"  <input class='rate-input' type='number' min='0' max='1000' step='0.01' value='{float(row.Oran):.2f}'> %"
-            f"  &rarr; <span class='telif-cell'></span>"
-            f"</td>"
-            f"</tr>"
-        )
-    table_rows = "\n".join(rows_html)
+            # .xls gibi openpyxl'in okuyamadığı dosyalar: parça parça okuma yok, tek seferde hesapla
+            try:
+                veri = await run_in_threadpool(veri_yukle, contents)
+                yield olay(await run_in_threadpool(sonuc_olayi, veri, start, end))
+            except Exception:
+                yield olay({"tur": "hata", "mesaj": "Dosya okunamadı."})
+            return
 
-    body = f"""
-    <div class="head">
-        <h2>Flu Akademi Dönemlik Ders Bazlı Satış Dökümü</h2>
-        <div class="info">
-            <div><strong>Seçilen Ders:</strong> {escape_html(ders)}</div>
-            <div><strong>Tarih Aralığı:</strong> {start_date} → {end_date}</div>
-            <div><strong>Not:</strong> Flu Akademi Eğitmen Telif Tablosu</div>
-        </div>
-        <div class="actions">
-            <label>Varsayılan Oran (%)</label>
-            <input id="global-rate" type="number" min="0" max="1000" step="0.01" value="{float(rate):.2f}">
-            <button id="apply-rate">Tüm Satırlara Uygula</button>
-            <button id="pdfBtn">PDF Olarak İndir</button>
-        </div>
-    </div>
+        try:
+            baslangic = await run_in_threadpool(onizleme_baslat, wb)
+            if baslangic is None:
+                yield olay({"tur": "hata", "mesaj": "Tarih, Ders ve Tutar sütunları bulunamadı."})
+                return
+            satirlar, idx, durum = baslangic
+
+            while True:
+                # Kullanıcı yüklemeyi iptal ettiyse okumayı bırak, sunucu kapasitesini boşa harcama
+                if await request.is_disconnected():
+                    return
+                try:
+                    # Okuma, çerçeve oluşturma ve toplama tek seferde thread havuzunda; olay döngüsü bloklanmaz
+                    ara = await run_in_threadpool(onizleme_parcasi, durum, satirlar, idx, parca_satir, start, end)
+                except Exception:
+                    yield olay({"tur": "hata", "mesaj": "Dosya işlenirken hata oluştu."})
+                    return
+                if ara is None:
+                    break
+                yield olay(ara)
+
+            # Kesin sonuç sıkıştırılmış veriden hesaplanır; veri sonraki dökümler için önbelleğe girer
+            try:
+                veri, sonuc = await run_in_threadpool(onizleme_sonucu, durum, start, end)
+            except Exception:
+                yield olay({"tur": "hata", "mesaj": "Dosya işlenirken hata oluştu."})
+                return
+            onbellege_ekle(anahtar, veri)
+            yield olay(sonuc)
+        finally:
+            wb.close()
+
+    return StreamingResponse(akis(), media_type="application/x-ndjson")
+
+def onizleme_baslat(wb):
+    # Başlığı okur; sütunlar yoksa None
+    ws = wb.worksheets[0]
+    satirlar = ws.iter_rows(values_only=True)
+    baslik = [sutun_adi(h) for h in next(satirlar, ())]
+    try:
+        idx = [baslik.index(c) for c in SATIS_SUTUNLARI]
+    except ValueError:
+        return None
+    durum = {
+        "toplam_satir": ws.max_row - 1 if ws.max_row else None,
+        "toplamlar": pd.Series(dtype=float),
+        "adetler": pd.Series(dtype=int),
+        "toplam": 0.0,
+        "islenen": 0,
+        "ilk_tarih": None,
+        "son_tarih": None,
+        "parcalar": [],
+    }
+    return satirlar, idx, durum
+
+def onizleme_parcasi(durum, satirlar, idx, parca_satir, start, end):
+    # Sıradaki parçayı okuyup ara toplamları günceller ve "onizleme" olayını döndürür; dosya bittiyse None
+    parca = list(islice(satirlar, parca_satir))
+    if not parca:
+        return None
+    durum["islenen"] += len(parca)
+
+    ham = satis_sutunlari(pd.DataFrame([[r[i] if i < len(r) else None for i in idx] for r in parca],
+                                       columns=SATIS_SUTUNLARI))
+    # Kesin sonuç için ham değerler saklanır; tarih/tutar dönüşümü veri_olustur'da tüm sütuna
+    # bir kez uygulanır (veri_yukle ile aynı)
+    durum["parcalar"].append(ham)
+    df = ham.assign(Tarih=pd.to_datetime(ham['Tarih'], errors='coerce'),
+                    Tutar=pd.to_numeric(ham['Tutar'], errors='coerce'))
+    if df['Tarih'].notna().any():
+        pmin, pmax = df['Tarih'].min(), df['Tarih'].max()
+        durum["ilk_tarih"] = pmin if durum["ilk_tarih"] is None else min(durum["ilk_tarih"], pmin)
+        durum["son_tarih"] = pmax if durum["son_tarih"] is None else max(durum["son_tarih"], pmax)
+
+    # Genel toplam dersi boş satırları da içerir (kesin sonuçla aynı)
+    filtered = df.loc[(df['Tarih'] >= start) & (df['Tarih'] <= end)]
+    durum["toplam"] += float(filtered['Tutar'].sum())
+    grp = filtered.groupby('Ders')['Tutar']
+    durum["toplamlar"] = durum["toplamlar"].add(grp.sum(), fill_value=0)
+    durum["adetler"] = durum["adetler"].add(grp.size(), fill_value=0)
+
+    tamamlanma = None
+    if durum["toplam_satir"]:
+        tamamlanma = round(min(100.0, durum["islenen"] * 100.0 / durum["toplam_satir"]), 1)
+    return {
+        "tur": "onizleme",
+        "islenen_satir": durum["islenen"],
+        "toplam_satir": durum["toplam_satir"],
+        "tamamlanma": tamamlanma,
+        **onizleme_ozeti(durum["toplamlar"], durum["adetler"], durum["toplam"],
+                         durum["ilk_tarih"], durum["son_tarih"]),
+    }
 
-    <table id="reportTable">
-        <thead>
-            <tr>
-                <th>Ay</th>
-                <th>Ders</th>
-                <th class="right">Toplam Satış (TL)</th>
-                <th class="right">İşlem Adedi</th>
-                <th class="right">Oran (%) → Telif (TL)</th>
-            </tr>
-        </thead>
-        <tbody>
-            {table_rows}
-        </tbody>
-        <tfoot>
-            <tr>
-                <th>Genel</th>
-                <th>—</th>
-                <th class="right" id="genel-toplam">0,00</th>
-                <th class="right" id="genel-islem">0</th>
-                <th class="right" id="genel-telif">0,00</th>
-            </tr>
-        </tfoot>
-    </table>
+def onizleme_sonucu(durum, start, end):
+    parcalar = durum["parcalar"]
+    tum = pd.concat(parcalar, ignore_index=True) if parcalar else pd.DataFrame(columns=SATIS_SUTUNLARI)
+    veri = veri_olustur(tum)
+    islenen = durum["islenen"]
+    return veri, {**sonuc_olayi(veri, start, end), "islenen_satir": islenen, "toplam_satir": islenen}
 
-    <script>
-        const fmt = (n) => (Number(n)||0).toLocaleString('tr-TR', {{ minimumFractionDigits:2, maximumFractionDigits:2 }});
-
-        function recalc() {{
-            let sumToplam = 0, sumIslem = 0, sumTelif = 0;
-
-            document.querySelectorAll('#reportTable tbody tr').forEach(tr => {{
-                const toplam = Number(tr.dataset.toplam) || 0;
-                sumToplam += toplam;
-
-                const islem = Number(tr.children[3].textContent.trim()) || 0;
-                sumIslem += islem;
-
-                const rateInp = tr.querySelector('.rate-input');
-                let oran = Number(rateInp.value) || 0;
-                if (!isFinite(oran) || oran < 0) oran = 0;
-
-                const dersKey = tr.dataset.ders;
-                const ayKey = tr.dataset.ay;
-                localStorage.setItem(`oran_${{dersKey}}_${{ayKey}}`, oran);
-
-                const telif = toplam * (oran / 100);
-                tr.querySelector('.telif-cell').textContent = fmt(telif);
-                sumTelif += telif;
-            }});
-
-            document.getElementById('genel-toplam').textContent = fmt(sumToplam);
-            document.getElementById('genel-islem').textContent = sumIslem.toString();
-            document.getElementById('genel-telif').textContent = fmt(sumTelif);
-        }}
-
-        document.querySelectorAll('#reportTable tbody tr').forEach(tr => {{
-            const dersKey = tr.dataset.ders;
-            const ayKey = tr.dataset.ay;
-            const savedRate = localStorage.getItem(`oran_${{dersKey}}_${{ayKey}}`);
-            if (savedRate !== null) {{
-                tr.querySelector('.rate-input').value = savedRate;
-            }}
-        }});
-
-        recalc();
-
-        document.querySelectorAll('.rate-input').forEach(inp => {{
-            inp.addEventListener('input', recalc);
-        }});
-
-        document.getElementById('apply-rate').addEventListener('click', () => {{
-            const g = Number(document.getElementById('global-rate').value) || 0;
-            document.querySelectorAll('.rate-input').forEach(inp => {{
-                inp.value = g;
-            }});
-            recalc();
-        }});
-
-        const {{ jsPDF }} = window.jspdf || {{}};
-        document.getElementById('pdfBtn').addEventListener('click', () => {{
-            const doc = new jsPDF();
-            doc.text("Flu Akademi Dönemlik Ders Bazlı Satış Dökümü", 14, 16);
-
-            const head = [["Ay","Ders","Toplam Satış (TL)","İşlem Adedi","Telif (TL)"]];
-            const body = Array.from(document.querySelectorAll('#reportTable tbody tr')).map(tr => {{
-                const ay = tr.children[0].textContent.trim();
-                const ders = tr.children[1].textContent.trim();
-                const toplam = tr.children[2].textContent.trim();
-                const islem = tr.children[3].textContent.trim();
-                const telif = tr.querySelector('.telif-cell').textContent.trim();
-                return [ay, ders, toplam, islem, telif];
-            }});
-            const foot = [[
-                "Genel","—",
-                document.getElementById('genel-toplam').textContent.trim(),
-                document.getElementById('genel-islem').textContent.trim(),
-                document.getElementById('genel-telif').textContent.trim()
-            ]];
-
-            doc.autoTable({{
-                head, body, foot,
-                startY: 22,
-                styles: {{ halign: 'right' }},
-                headStyles: {{ halign: 'right' }},
-                columnStyles: {{ 0: {{halign: 'left'}}, 1: {{halign: 'left'}} }}
-            }});
-            doc.save("aylik_dokum.pdf");
-        }});
-    </script>
-    """
+def olay(veri):
+    # numpy sayıları (ör. sayısal ders kodları) JSON'a düz Python değeri olarak yazılır
+    return json.dumps(veri, ensure_ascii=False, default=lambda o: o.item() if hasattr(o, "item") else str(o)) + "\n"
 
-    return HTMLResponse(content=wrap_html(body, title="Aylık Döküm", add_pdf_scripts=True))
+def sonuc_olayi(veri, start, end):
+    return {
+        "tur": "sonuc",
+        "tamamlanma": 100.0,
+        **analiz_sonucu(veri, start, end, adet=True),
+        "tarih_araligi": tarih_araligi(veri),
+    }
 
+def onizleme_ozeti(toplamlar, adetler, toplam, ilk_tarih, son_tarih):
+    # Ders adları sayı ve metin karışık olabilir; kesin sonuçla aynı sırada (önce sayılar) listele
+    toplamlar = toplamlar.reindex(pd.factorize(toplamlar.index.to_numpy(dtype=object), sort=True)[1])
+    return {
+        "total": toplam,
+        "detaylar": [
+            {"ders": ders, "tutar": float(tutar), "adet": int(adetler.get(ders, 0))}
+            for ders, tutar in toplamlar.items()
+        ],
+        "tarih_araligi": {
+            "ilk": ilk_tarih.date().isoformat() if ilk_tarih is not None else None,
+            "son": son_tarih.date().isoformat() if son_tarih is not None else None,
+        },
+    }
 
+def aylik_ozet(veri, kodlar, start, end):
+    # Her dersin satırları tarihe göre sıralı; aynı ada düşen birden fazla kod varsa dilimler birleştirilip yeniden sıralanır
+    dilimler = [slice(*ders_araligi(veri, kod, start, end)) for kod in kodlar]
+    tarihler = np.concatenate([veri.tarihler[:0]] + [veri.tarihler[d] for d in dilimler])
+    tutarlar = np.concatenate([veri.tutarlar[:0]] + [veri.tutarlar[d] for d in dilimler])
+    if len(dilimler) > 1:
+        sira = np.argsort(tarihler, kind='stable')
+        tarihler, tutarlar = tarihler[sira], tutarlar[sira]
+
+    # Aynı aya düşen satırlar ardışıktır
+    aylar = tarihler.view('datetime64[ns]').astype('datetime64[M]')
+    if not len(aylar):
+        return pd.DataFrame({'Ay': [], 'Toplam': [], 'IslemAdedi': []})
+    baslar = np.flatnonzero(np.r_[True, aylar[1:] != aylar[:-1]])
+    return pd.DataFrame({
+        'Ay': np.datetime_as_string(aylar[baslar], unit='M'),
+        'Toplam': np.add.reduceat(tutarlar, baslar),
+        'IslemAdedi': np.diff(np.r_[baslar, len(aylar)]),
+    })
 
+@app.post("/aylik-dokum", response_class=HTMLResponse)
+async def aylik_dokum(
+    file: UploadFile = File(...),
+    start_date: str = Form(...),
+    end_date: str = Form(...),
+    ders: str = Form(...),
+    rate: float = Form(...),
+    rates: str = Form(None)
+):
     contents = await file.read()
-    df = pd.read_excel(BytesIO(contents))
-
-    # Kolonlar ve tarih filtresi
-    df = df[['Tarih', 'Ders', 'Tutar']]
-    df['Tarih'] = pd.to_datetime(df['Tarih'], errors='coerce')
-    df = df.dropna(subset=['Tarih'])
+    veri = await run_in_threadpool(veri_yukle, contents)
     start = datetime.strptime(start_date, "%Y-%m-%d")
     end = datetime.strptime(end_date, "%Y-%m-%d")
-    base = df[(df['Tarih'] >= start) & (df['Tarih'] <= end)].copy()
 
-    # Dashboard’tan gelen oranlar
     try:
         rates_map = json.loads(rates) if rates else {}
     except Exception:
         rates_map = {}
 
-    # Dahil edilecek dersler: tıklanan + "Tüm" ile başlayanlar
     include_dersler = [str(ders)]
-    tum_dersler = sorted(set(base['Ders'][base['Ders'].astype(str).str.startswith('Tüm')].astype(str)))
+    tum_dersler = sorted(ad for ad in veri.ders_kodlari if ad.startswith('Tüm'))
     include_dersler.extend([d for d in tum_dersler if d not in include_dersler])
 
-    # Her ders için ay-ay grupla (Ay + Ders + Toplam + IslemAdedi + Oran)
     monthly_frames = []
     for dname in include_dersler:
-        sub = base[base['Ders'].astype(str) == dname].copy()
-        if sub.empty:
+        kodlar = veri.ders_kodlari.get(dname)
+        if kodlar is None:
             continue
-        sub['Ay'] = sub['Tarih'].dt.to_period('M').astype(str)
-        grp = (sub.groupby('Ay', as_index=False)
-                  .agg(Toplam=('Tutar','sum'), IslemAdedi=('Tutar','size')))
-        d_rate = float(rates_map.get(dname, rate))  # dashboardtaki oran varsa onu kullan
+        grp = aylik_ozet(veri, kodlar, start, end)
+        if grp.empty:
+            continue
+        d_rate = float(rates_map.get(dname, rate))
         grp['Ders'] = dname
         grp['Oran'] = d_rate
         monthly_frames.append(grp)
 
     if not monthly_frames:
         return HTMLResponse(content=wrap_html(
-            f"<p style='font-family:Montserrat,sans-serif'>Seçilen aralıkta kayıt bulunamadı.</p>",
-            title="Aylık Döküm",
-            add_pdf_scripts=True
+            "<p style='font-family:Montserrat,sans-serif'>Seçilen aralıkta kayıt bulunamadı.</p>",
+            title="Aylık Döküm"
         ))
 
     monthly_all = pd.concat(monthly_frames, ignore_index=True).sort_values(['Ay','Ders'])
 
-    # Satırları oluştur (Telif JS tarafından oran değişince dinamik hesaplanacak)
     def fmt(n):
         try:
             return f"{float(n):,.2f}".replace(",", "X").replace(".", ",").replace("X", ".")
@@ -562,7 +551,6 @@ async def aylik_dokum(
         )
     table_rows = "\n".join(rows_html)
 
-    # Sayfa gövdesi (Oran değişince footer ve hücreler canlı güncellenir)
     body = f"""
     <div class="head">
         <h2>Flu Akademi Dönemlik Ders Bazlı Satış Dökümü</h2>
@@ -575,6 +563,7 @@ async def aylik_dokum(
             <label>Varsayılan Oran (%)</label>
             <input id="global-rate" type="number" min="0" max="1000" step="0.01" value="{float(rate):.2f}">
             <button id="apply-rate">Tüm Satırlara Uygula</button>
+            <button id="pdfBtn">PDF Olarak İndir</button>
         </div>
     </div>
 
@@ -601,89 +590,6 @@ async def aylik_dokum(
             </tr>
         </tfoot>
     </table>
-
-    <script>
-        const fmt = (n) => (Number(n)||0).toLocaleString('tr-TR', {{minimumFractionDigits:2, maximumFractionDigits:2}});
-
-        function recalc() {{
-            let sumToplam = 0, sumIslem = 0, sumTelif = 0;
-
-            document.querySelectorAll('#reportTable tbody tr').forEach(tr => {{
-                const toplam = Number(tr.dataset.toplam) || 0;
-                sumToplam += toplam;
-
-                const islem = Number(tr.children[3].textContent.trim()) || 0;
-                sumIslem += islem;
-
-                const rateInp = tr.querySelector('.rate-input');
-                let oran = Number(rateInp.value) || 0;
-                if (!isFinite(oran) || oran < 0) oran = 0;
-
-                // localStorage'a kaydet
-                const dersKey = tr.dataset.ders;
-                const ayKey = tr.dataset.ay;
-                localStorage.setItem(`oran_${dersKey}_${ayKey}`, oran);
-
-                const telif = toplam * (oran / 100);
-                tr.querySelector('.telif-cell').textContent = fmt(telif);
-                sumTelif += telif;
-            }});
-
-            document.getElementById('genel-toplam').textContent = fmt(sumToplam);
-            document.getElementById('genel-islem').textContent = sumIslem.toString();
-            document.getElementById('genel-telif').textContent = fmt(sumTelif);
-        }}
-
-        
-        // Başlangıçta hesapla
-        recalc();
-
-        // Satır oranları değiştikçe canlı hesap
-        document.querySelectorAll('.rate-input').forEach(inp => {{
-            inp.addEventListener('input', recalc);
-        }});
-
-        // Global oran uygula
-        document.getElementById('apply-rate').addEventListener('click', () => {{
-            const g = Number(document.getElementById('global-rate').value)||0;
-            document.querySelectorAll('.rate-input').forEach(inp => {{
-                inp.value = g;
-            }});
-            recalc();
-        }});
-
-        // PDF export (güncel değerleri okur)
-        const {{ jsPDF }} = window.jspdf || {{}};
-        document.getElementById('pdfBtn').addEventListener('click', () => {{
-            const doc = new jsPDF();
-            doc.text("Flu Akademi Dönemlik Ders Bazlı Satış Dökümü", 14, 16);
-
-            const head = [["Ay","Ders","Toplam Satış (TL)","İşlem Adedi","Telif (TL)"]];
-            const body = Array.from(document.querySelectorAll('#reportTable tbody tr')).map(tr => {{
-                const ay = tr.children[0].textContent.trim();
-                const ders = tr.children[1].textContent.trim();
-                const toplam = tr.children[2].textContent.trim();
-                const islem = tr.children[3].textContent.trim();
-                const telif = tr.querySelector('.telif-cell').textContent.trim();
-                return [ay, ders, toplam, islem, telif];
-            }});
-            const foot = [[
-                "Genel","—",
-                document.getElementById('genel-toplam').textContent.trim(),
-                document.getElementById('genel-islem').textContent.trim(),
-                document.getElementById('genel-telif').textContent.trim()
-            ]];
-
-            doc.autoTable({{
-                head, body, foot,
-                startY: 22,
-                styles: {{ halign: 'right' }},
-                headStyles: {{ halign: 'right' }},
-                columnStyles: {{ 0: {{halign: 'left'}}, 1: {{halign: 'left'}} }}
-            }});
-            doc.save("aylik_dokum.pdf");
-        }});
-    </script>
     """
 
     return HTMLResponse(content=wrap_html(body, title="Aylık Döküm", add_pdf_scripts=True))
@@ -692,35 +598,23 @@ def escape_html(s):
     return str(s).replace("&","&amp;").replace("<","&lt;").replace(">","&gt;").replace('"',"&quot;")
 
 def wrap_html(inner, title="Rapor", add_pdf_scripts=False):
-    pdf_scripts = """
-    <script src="https://cdnjs.cloudflare.com/ajax/libs/jspdf/2.5.1/jspdf.umd.min.js"></script>
-    <script src="https://cdnjs.cloudflare.com/ajax/libs/jspdf-autotable/3.8.2/jspdf.plugin.autotable.min.js"></script>
-    """ if add_pdf_scripts else ""
-
-    return f"""
-    <html>
-    <head>
-        <meta charset="utf-8">
-        <title>{title}</title>
-        <style>
-            body {{ font-family: Montserrat, Arial, sans-serif; background:#f7f7f8; color:#05111E; padding: 30px; }}
-            .head {{ display:flex; flex-wrap:wrap; gap:16px; align-items:flex-end; justify-content:space-between; margin-bottom:14px; }}
-            .info {{ display:grid; gap:4px; min-width:260px; }}
-            .actions {{ display:flex; gap:8px; align-items:center; }}
-            .actions input {{ width:120px; padding:8px 10px; border:1px solid #e5e7eb; border-radius:10px; }}
-            .actions button {{ background:#111827; color:#fff; padding:10px 12px; border:none; border-radius:10px; cursor:pointer; }}
-            .actions button:hover {{ opacity:.9; }}
-            table {{ width:100%; background:#fff; border-collapse: collapse; border-radius:12px; overflow:hidden; box-shadow:0 8px 24px rgba(0,0,0,.06); }}
-            th, td {{ padding:12px 14px; border-bottom:1px solid #eef0f3; }}
-            th {{ background:#f3f4f6; text-align:left; }}
-            .right {{ text-align:right; }}
-            .rate-input {{ width:90px; padding:6px 8px; border:1px solid #e5e7eb; border-radius:8px; }}
-            tfoot th {{ background:#f9fafb; }}
-        </style>
-    </head>
-    <body>
-        {inner}
-        {pdf_scripts}
-    </body>
-    </html>
-    """
+    # Stil ve betikler sürümlü statik dosyalardan gelir; yanıtta yalnızca veriye özgü işaretleme kalır
+    pdf_scripts = "".join(
+        f'<script src="{STATIK_URL[ad]}"></script>'
+        for ad in (*PDF_KUTUPHANELERI, "rapor.js")
+        if ad in STATIK_URL
+    ) if add_pdf_scripts else ""
+
+    return f"""<!DOCTYPE html>
+<html>
+<head>
+    <meta charset="utf-8">
+    <title>{title}</title>
+    <link rel="stylesheet" href="{STATIK_URL['rapor.css']}">
+</head>
+<body>
+    {inner}
+    {pdf_scripts}
+</body>
+</html>
+"""
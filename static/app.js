@@ -0,0 +1,259 @@
+const form = document.getElementById("upload-form");
+const resultEl = document.getElementById("result");
+const fmt = (n) => (Number(n) || 0).toLocaleString('tr-TR', { minimumFractionDigits: 2, maximumFractionDigits: 2 });
+
+function recalcSummary() {
+    // Tüm satırların oran * toplam tutarlarının toplamını hesapla
+    let sum = 0;
+    resultEl.querySelectorAll("tr[data-ders]").forEach(row => {
+        const toplam = Number(row.dataset.toplam) || 0;
+        const oran = Number(row.querySelector(".rate-input").value) || 0;
+        sum += toplam * (oran/100);
+    });
+    const el = resultEl.querySelector("#telif-toplam");
+    if (el) el.textContent = fmt(sum);
+}
+
+// Devam eden önizleme akışı (iptal için)
+let aktifIstek = null;
+
+function renderPreview(ev) {
+    // Kesin sonuç gelene kadar ilk parçalardan hesaplanan ara tahmini göster
+    const yuzde = ev.tamamlanma ?? 0;
+    const aralik = ev.tarih_araligi || {};
+    let html = `
+        <div class="controls">
+            <span class="pill">Önizleme: <strong>${ev.tamamlanma == null ? "?" : fmt(yuzde)}</strong> %</span>
+            <span class="pill">İşlenen Satır: <strong>${ev.islenen_satir}</strong>${ev.toplam_satir ? " / " + ev.toplam_satir : ""}</span>
+            <span class="pill">Dosyadaki Tarihler: <strong>${aralik.ilk ?? "—"} → ${aralik.son ?? "—"}</strong></span>
+            <button id="cancel-upload" class="btn-mini btn-cancel" type="button">İptal</button>
+        </div>
+        <div class="progress"><div style="width:${yuzde}%"></div></div>
+        <table>
+            <thead>
+                <tr>
+                    <th>📘 Ders</th>
+                    <th class="right">Ara Toplam (TL)</th>
+                    <th class="right">İşlem Adedi</th>
+                </tr>
+            </thead>
+            <tbody>
+    `;
+    for (const item of ev.detaylar) {
+        const ders = (item.ders ?? "").toString().replace(/&/g, "&amp;").replace(/</g, "&lt;");
+        html += `<tr><td>${ders}</td><td class="right">${fmt(item.tutar)}</td><td class="right">${item.adet}</td></tr>`;
+    }
+    html += `
+            </tbody>
+        </table>
+        <div class="summary">
+            <span class="pill">Ara Genel Toplam: <strong>${fmt(ev.total)}</strong> TL</span>
+        </div>
+    `;
+    resultEl.innerHTML = html;
+    resultEl.querySelector("#cancel-upload").addEventListener("click", () => {
+        if (aktifIstek) aktifIstek.abort();
+    });
+}
+
+form.onsubmit = async (e) => {
+    e.preventDefault();
+    const formData = new FormData(form);
+
+    if (!formData.get("file") || !formData.get("start_date") || !formData.get("end_date")) {
+        resultEl.innerHTML = "<p>Lütfen dosya ve tarihleri seçin.</p>";
+        return;
+    }
+
+    if (aktifIstek) aktifIstek.abort();
+    const ctrl = new AbortController();
+    aktifIstek = ctrl;
+    resultEl.innerHTML = '<p class="muted">Dosya yükleniyor…</p>';
+
+    try {
+        const res = await fetch("/analiz-onizleme", { method: "POST", body: formData, signal: ctrl.signal });
+        if (!res.ok) throw new Error("İstek başarısız: " + res.status);
+
+        // NDJSON akışı: her satır bir olay
+        const reader = res.body.getReader();
+        const decoder = new TextDecoder();
+        let buf = "";
+        let sonuc = null;
+        while (true) {
+            const { value, done } = await reader.read();
+            if (done) break;
+            buf += decoder.decode(value, { stream: true });
+            let nl;
+            while ((nl = buf.indexOf("\n")) >= 0) {
+                const line = buf.slice(0, nl).trim();
+                buf = buf.slice(nl + 1);
+                if (!line) continue;
+                const ev = JSON.parse(line);
+                if (ev.tur === "hata") throw new Error(ev.mesaj);
+                if (ev.tur === "onizleme") renderPreview(ev);
+                if (ev.tur === "sonuc") sonuc = ev;
+            }
+        }
+        if (!sonuc) throw new Error("Yanıt tamamlanmadı.");
+        aktifIstek = null;
+        renderResult(sonuc);
+    } catch (err) {
+        // Yeni bir yükleme başladıysa bu isteğin sonucunu yok say
+        if (aktifIstek !== ctrl) return;
+        aktifIstek = null;
+        if (ctrl.signal.aborted) {
+            resultEl.innerHTML = '<p class="muted">Yükleme iptal edildi.</p>';
+            return;
+        }
+        console.error(err);
+        resultEl.innerHTML = "<p>Bir hata oluştu. Lütfen dosya sütunlarını ve tarih aralığını kontrol edin.</p>";
+    }
+};
+
+function renderResult(data) {
+    // Varsayılan oran
+    const defaultRate = 20;
+
+    let html = `
+        <div class="controls">
+            <span class="pill">Genel Toplam: <strong>${fmt(data.total)}</strong> TL</span>
+            <label>Varsayılan Oran (%)</label>
+            <input type="number" id="global-rate" min="0" max="1000" step="0.01" value="${defaultRate}">
+            <button id="apply-rate" class="btn-mini" type="button">Uygula</button>
+        </div>
+        <table>
+            <thead>
+                <tr>
+                    <th>📘 Ders</th>
+                    <th class="right">Toplam Satış (TL)</th>
+                    <th class="right">% Oran → Tutar (TL)</th>
+                    <th>İşlem</th>
+                </tr>
+            </thead>
+            <tbody>
+    `;
+
+    for (const item of data.detaylar) {
+        const toplam = Number(item.tutar) || 0;
+        const oran = defaultRate;
+        const tutarYuzde = toplam * (oran/100);
+        const ders = (item.ders ?? "").toString().replace(/"/g, '&quot;');
+        html += `
+            <tr data-ders="${ders}" data-toplam="${toplam}">
+                <td>${ders}</td>
+                <td class="right toplam">${fmt(toplam)}</td>
+                <td class="right">
+                    <input class="rate-input" type="number" min="0" max="1000" step="0.01" value="${oran}"> %
+                    &rarr; <span class="rate-amount">${fmt(tutarYuzde)}</span>
+                </td>
+                <td><button class="btn-mini hesapla-btn" data-ders="${ders}">Hesapla</button></td>
+            </tr>
+        `;
+    }
+
+    html += `
+            </tbody>
+        </table>
+        <div class="summary">
+            <span class="pill">Toplam Telif Tutarı: <strong id="telif-toplam">${fmt( data.detaylar.reduce((acc,i)=>acc+(Number(i.tutar)||0)*(defaultRate/100), 0 ) )}</strong> TL</span>
+        </div>
+    `;
+
+    resultEl.innerHTML = html;
+
+    // Satır bazında oran değişiminde hesapla + özet güncelle
+    resultEl.querySelectorAll("input.rate-input").forEach(inp => {
+        inp.addEventListener("input", () => {
+            const row = inp.closest("tr");
+            const toplam = Number(row.dataset.toplam) || 0;
+            let oran = Number(inp.value);
+            if (!isFinite(oran)) oran = 0;
+            if (oran < 0) oran = 0;
+            const tutar = toplam * (oran/100);
+            row.querySelector(".rate-amount").textContent = fmt(tutar);
+            recalcSummary();
+        });
+    });
+
+    // Global oran uygula
+    const applyBtn = resultEl.querySelector("#apply-rate");
+    applyBtn.addEventListener("click", () => {
+        const globalRate = Number(resultEl.querySelector("#global-rate").value) || 0;
+        resultEl.querySelectorAll("tr[data-ders] .rate-input").forEach(inp => {
+            inp.value = globalRate;
+            inp.dispatchEvent(new Event("input"));
+        });
+        recalcSummary();
+    });
+
+    // "Hesapla" -> yeni sekmede aylık döküm aç
+    resultEl.querySelectorAll(".hesapla-btn").forEach(btn => {
+        btn.addEventListener("click", (ev) => {
+            ev.preventDefault();
+
+            const row = btn.closest("tr");
+            const ders = btn.getAttribute("data-ders");
+            const oran = Number(row.querySelector(".rate-input").value) || 0;
+
+            // Aynı dosya + tarihleri tekrar göndererek yeni sekmede açıyoruz
+            const tempForm = document.createElement("form");
+            tempForm.method = "POST";
+            tempForm.enctype = "multipart/form-data";
+            tempForm.action = "/aylik-dokum";
+            tempForm.target = "_blank";
+
+            // Orijinal formdaki alanları kopyala
+            const fd = new FormData(form);
+            for (const [k,v] of fd.entries()) {
+                if (v instanceof File) {
+                    const fileInput = document.createElement("input");
+                    fileInput.type = "file";
+                    fileInput.name = k;
+                    // Not: File nesnesini programatik olarak yeniden set etmek mümkün değil.
+                    // Bunun için aşağıdaki workaround: mevcut input elementini klonlayıp forma ekleyelim.
+                    // Basit yol: doğrudan orijinal input'u formun içine taşıyıp sonra geri koymak.
+                }
+            }
+
+            // Pratik çözüm: gizli inputlar ile tarihleri ve ders/oranı ekleyip,
+            // dosya input'unu da DOM'dan kopyalayıp bu forma clone ederek ekleyeceğiz.
+            // (Tarayıcılar programatik File set etmeye izin vermez.)
+            const originalFileInput = form.querySelector('input[type="file"][name="file"]');
+            if (!originalFileInput || !originalFileInput.files || originalFileInput.files.length === 0) {
+                alert("Lütfen dosyayı yeniden seçin.");
+                return;
+            }
+
+            // Yeni form içine bir file input kopyası koy
+            const fileClone = originalFileInput.cloneNode();
+            // Kullanıcı etkileşimi olmadan File listesini aktaramayız; bu yüzden
+            // yeni bir FormData üzerinden submit gerekiyor. Bunun için iframe/target
+            // yaklaşımında file'ı yeniden seçmek gerekir. Basit ve çalışır yöntem:
+            // Geçici bir form yaratıp orijinal input'u bu forma move et, submit et, sonra geri koy.
+            const placeholder = document.createElement("span");
+            originalFileInput.parentNode.insertBefore(placeholder, originalFileInput);
+            tempForm.appendChild(originalFileInput); // inputu geçici forma taşı
+            
+            // Diğer alanlar
+            const addHidden = (name, value) => {
+                const inp = document.createElement("input");
+                inp.type = "hidden";
+                inp.name = name;
+                inp.value = value;
+                tempForm.appendChild(inp);
+            };
+            addHidden("start_date", form.querySelector('input[name="start_date"]').value);
+            addHidden("end_date", form.querySelector('input[name="end_date"]').value);
+            addHidden("ders", ders);
+            addHidden("rate", oran.toString());
+
+            document.body.appendChild(tempForm);
+            tempForm.submit();
+
+            // File input'u eski yerine geri koy
+            placeholder.parentNode.insertBefore(originalFileInput, placeholder);
+            placeholder.remove();
+            tempForm.remove();
+        });
+    });
+}
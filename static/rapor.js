@@ -0,0 +1,88 @@
+const fmt = (n) => (Number(n)||0).toLocaleString('tr-TR', { minimumFractionDigits:2, maximumFractionDigits:2 });
+
+function recalc() {
+    let sumToplam = 0, sumIslem = 0, sumTelif = 0;
+
+    document.querySelectorAll('#reportTable tbody tr').forEach(tr => {
+        const toplam = Number(tr.dataset.toplam) || 0;
+        sumToplam += toplam;
+
+        const islem = Number(tr.children[3].textContent.trim()) || 0;
+        sumIslem += islem;
+
+        const rateInp = tr.querySelector('.rate-input');
+        let oran = Number(rateInp.value) || 0;
+        if (!isFinite(oran) || oran < 0) oran = 0;
+
+        const dersKey = tr.dataset.ders;
+        const ayKey = tr.dataset.ay;
+        localStorage.setItem(`oran_${dersKey}_${ayKey}`, oran);
+
+        const telif = toplam * (oran / 100);
+        tr.querySelector('.telif-cell').textContent = fmt(telif);
+        sumTelif += telif;
+    });
+
+    document.getElementById('genel-toplam').textContent = fmt(sumToplam);
+    document.getElementById('genel-islem').textContent = sumIslem.toString();
+    document.getElementById('genel-telif').textContent = fmt(sumTelif);
+}
+
+document.querySelectorAll('#reportTable tbody tr').forEach(tr => {
+    const dersKey = tr.dataset.ders;
+    const ayKey = tr.dataset.ay;
+    const savedRate = localStorage.getItem(`oran_${dersKey}_${ayKey}`);
+    if (savedRate !== null) {
+        tr.querySelector('.rate-input').value = savedRate;
+    }
+});
+
+recalc();
+
+document.querySelectorAll('.rate-input').forEach(inp => {
+    inp.addEventListener('input', recalc);
+});
+
+document.getElementById('apply-rate').addEventListener('click', () => {
+    const g = Number(document.getElementById('global-rate').value) || 0;
+    document.querySelectorAll('.rate-input').forEach(inp => {
+        inp.value = g;
+    });
+    recalc();
+});
+
+const { jsPDF } = window.jspdf || {};
+document.getElementById('pdfBtn').addEventListener('click', () => {
+    // Kütüphaneler static/vendor altından sunulur; dosyalar eksikse kullanıcıyı uyar
+    if (!jsPDF) {
+        alert("PDF kütüphanesi yüklenemedi.");
+        return;
+    }
+    const doc = new jsPDF();
+    doc.text("Flu Akademi Dönemlik Ders Bazlı Satış Dökümü", 14, 16);
+
+    const head = [["Ay","Ders","Toplam Satış (TL)","İşlem Adedi","Telif (TL)"]];
+    const body = Array.from(document.querySelectorAll('#reportTable tbody tr')).map(tr => {
+        const ay = tr.children[0].textContent.trim();
+        const ders = tr.children[1].textContent.trim();
+        const toplam = tr.children[2].textContent.trim();
+        const islem = tr.children[3].textContent.trim();
+        const telif = tr.querySelector('.telif-cell').textContent.trim();
+        return [ay, ders, toplam, islem, telif];
+    });
+    const foot = [[
+        "Genel","—",
+        document.getElementById('genel-toplam').textContent.trim(),
+        document.getElementById('genel-islem').textContent.trim(),
+        document.getElementById('genel-telif').textContent.trim()
+    ]];
+
+    doc.autoTable({
+        head, body, foot,
+        startY: 22,
+        styles: { halign: 'right' },
+        headStyles: { halign: 'right' },
+        columnStyles: { 0: {halign: 'left'}, 1: {halign: 'left'} }
+    });
+    doc.save("aylik_dokum.pdf");
+});
@@ -0,0 +1,276 @@
+import hashlib
+import json
+import os
+import re
+from datetime import datetime
+from io import BytesIO
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+import pytest
+from fastapi.testclient import TestClient
+
+import satis_analiz_webapp
+from satis_analiz_webapp import app, STATIC_DIR, veri_olustur, analiz_sonucu, aylik_ozet, veri_yukle
+
+DERSLER = np.array(["Matematik", "Fizik", "Tüm Dersler Paketi", 1, 2, "1", None], dtype=object)
+
+
+def ornek_cerceve(tohum, satir=3000):
+    rng = np.random.default_rng(tohum)
+    tarih = (pd.Timestamp("2024-01-01")
+             + pd.to_timedelta(rng.integers(0, 365, satir), unit="D")
+             + pd.to_timedelta(rng.integers(0, 24 * 60, satir) * rng.integers(0, 2, satir), unit="min"))
+    tarih = pd.Series(tarih, dtype=object)
+    tarih[rng.random(satir) < 0.02] = "geçersiz"
+    tutar = rng.uniform(-50, 900, satir).round(2)
+    tutar[rng.random(satir) < 0.02] = np.nan
+    return pd.DataFrame({
+        "Tarih": tarih,
+        "Ders": DERSLER[rng.integers(0, len(DERSLER), satir)],
+        "Tutar": tutar,
+    })
+
+
+def eski_cerceve(df):
+    df = df.copy()
+    df["Tarih"] = pd.to_datetime(df["Tarih"], errors="coerce")
+    return df
+
+
+def anahtar(ders):
+    ders = ders.item() if hasattr(ders, "item") else ders
+    return (type(ders).__name__, ders)
+
+
+ARALIKLAR = [
+    ("2024-01-01", "2024-12-31"),
+    ("2024-03-15", "2024-03-15"),
+    ("2024-02-29", "2024-07-01"),
+    ("2023-01-01", "2023-12-31"),
+]
+
+
+@pytest.mark.parametrize("tohum", [0, 1, 2])
+@pytest.mark.parametrize("baslangic,bitis", ARALIKLAR)
+def test_analiz_sonucu_eski_groupby_ile_ayni(tohum, baslangic, bitis):
+    df = ornek_cerceve(tohum)
+    start, end = datetime.fromisoformat(baslangic), datetime.fromisoformat(bitis)
+
+    eski = eski_cerceve(df)
+    filtered = eski.loc[(eski["Tarih"] >= start) & (eski["Tarih"] <= end)]
+    beklenen = {anahtar(d): t for d, t in filtered.groupby("Ders")["Tutar"].sum().items()}
+
+    sonuc = analiz_sonucu(veri_olustur(df), start, end)
+    assert sonuc["total"] == pytest.approx(float(filtered["Tutar"].sum()), rel=1e-12, abs=1e-9)
+    assert {anahtar(d["ders"]) for d in sonuc["detaylar"]} == set(beklenen)
+    for d in sonuc["detaylar"]:
+        assert d["tutar"] == pytest.approx(beklenen[anahtar(d["ders"])], rel=1e-12, abs=1e-9)
+
+
+@pytest.mark.parametrize("tohum", [0, 1, 2])
+@pytest.mark.parametrize("baslangic,bitis", ARALIKLAR)
+@pytest.mark.parametrize("ders", ["Matematik", "Tüm Dersler Paketi", "1", "2", "Yok"])
+def test_aylik_ozet_eski_groupby_ile_ayni(tohum, baslangic, bitis, ders):
+    df = ornek_cerceve(tohum)
+    start, end = datetime.fromisoformat(baslangic), datetime.fromisoformat(bitis)
+
+    eski = eski_cerceve(df).dropna(subset=["Tarih"])
+    base = eski[(eski["Tarih"] >= start) & (eski["Tarih"] <= end)]
+    sub = base[base["Ders"].astype(str) == ders].copy()
+    sub["Ay"] = sub["Tarih"].dt.to_period("M").astype(str)
+    beklenen = sub.groupby("Ay", as_index=False).agg(Toplam=("Tutar", "sum"), IslemAdedi=("Tutar", "size"))
+
+    veri = veri_olustur(df)
+    kodlar = veri.ders_kodlari.get(ders, ())
+    sonuc = aylik_ozet(veri, kodlar, start, end)
+    assert list(sonuc["Ay"]) == list(beklenen["Ay"])
+    assert list(sonuc["IslemAdedi"]) == list(beklenen["IslemAdedi"])
+    assert list(sonuc["Toplam"]) == pytest.approx(list(beklenen["Toplam"]), rel=1e-12, abs=1e-9)
+
+
+def test_ayni_metne_dusen_ders_kodlari_kaybolmaz():
+    df = pd.DataFrame({
+        "Tarih": pd.to_datetime(["2024-01-01", "2024-01-02", "2024-01-03"]),
+        "Ders": [1, "1", "A"],
+        "Tutar": [10.0, 5.0, 1.0],
+    })
+    veri = veri_olustur(df)
+    assert len(veri.ders_kodlari["1"]) == 2
+
+    sonuc = analiz_sonucu(veri, datetime(2024, 1, 1), datetime(2024, 1, 3))
+    assert [(anahtar(d["ders"]), d["tutar"]) for d in sonuc["detaylar"]] == [
+        (("int", 1), 10.0), (("str", "1"), 5.0), (("str", "A"), 1.0),
+    ]
+    aylik = aylik_ozet(veri, veri.ders_kodlari["1"], datetime(2024, 1, 1), datetime(2024, 1, 3))
+    assert list(aylik["Toplam"]) == [15.0]
+    assert list(aylik["IslemAdedi"]) == [2]
+
+
+@pytest.fixture
+def istemci():
+    with TestClient(app) as c:
+        yield c
+
+
+def test_ana_sayfa_icerik_ozetli_statik_adreslere_baglanir(istemci):
+    html = istemci.get("/").text
+    for ad in ("app.css", "app.js"):
+        with open(os.path.join(STATIC_DIR, ad), "rb") as f:
+            ozet = hashlib.sha256(f.read()).hexdigest()[:12]
+        kok, uzanti = os.path.splitext(ad)
+        assert f"/static/{kok}.{ozet}{uzanti}" in html
+
+
+def statik_adres(istemci, ad):
+    html = istemci.get("/").text
+    kok, uzanti = os.path.splitext(ad)
+    return re.search(rf"/static/{kok}\.[0-9a-f]{{12}}\{uzanti}", html).group(0)
+
+
+@pytest.mark.parametrize("kabul,beklenen", [
+    ("br, gzip", "br"),
+    ("gzip", "gzip"),
+    ("gzip;q=0.5, br;q=0", "gzip"),
+    ("br;q=0, gzip;q=0.0", None),
+    ("br;q=0, gzip;q=0, *", None),
+    ("*", "br"),
+    ("identity", None),
+])
+def test_statik_kodlama_secimi_ve_kodlamaya_ozel_etag(istemci, kabul, beklenen):
+    adres = statik_adres(istemci, "app.js")
+    with open(os.path.join(STATIC_DIR, "app.js"), "rb") as f:
+        icerik = f.read()
+
+    r = istemci.get(adres, headers={"accept-encoding": kabul})
+    assert r.status_code == 200
+    assert r.headers.get("content-encoding") == beklenen
+    assert r.content == icerik
+    assert r.headers["etag"].endswith(f'-{beklenen or "identity"}"')
+    assert "immutable" in r.headers["cache-control"]
+    assert "Accept-Encoding" in r.headers["vary"]
+
+
+def test_etag_eslesirse_304_doner(istemci):
+    adres = statik_adres(istemci, "app.css")
+    etag = istemci.get(adres, headers={"accept-encoding": "gzip"}).headers["etag"]
+
+    assert istemci.get(adres, headers={"accept-encoding": "gzip", "if-none-match": etag}).status_code == 304
+    assert istemci.get(adres, headers={"accept-encoding": "gzip", "if-none-match": f'"x", W/{etag}'}).status_code == 304
+    # Başka kodlamanın etiketi bu gövdeyi doğrulamaz
+    assert istemci.get(adres, headers={"accept-encoding": "br", "if-none-match": etag}).status_code == 200
+
+    etag = istemci.get("/", headers={"accept-encoding": "identity"}).headers["etag"]
+    assert istemci.get("/", headers={"accept-encoding": "identity", "if-none-match": etag}).status_code == 304
+
+
+def test_bilinmeyen_statik_dosya_404(istemci):
+    assert istemci.get("/static/app.css").status_code == 404
+
+
+def ornek_xlsx(df):
+    buf = BytesIO()
+    df.to_excel(buf, index=False)
+    return buf.getvalue()
+
+
+@pytest.fixture
+def bos_onbellek():
+    satis_analiz_webapp._veri_onbellegi.clear()
+    yield
+    satis_analiz_webapp._veri_onbellegi.clear()
+
+
+def test_onizleme_ve_veri_yukle_ayni_veriyi_uretir(istemci, bos_onbellek):
+    df = ornek_cerceve(4, satir=2500).rename(columns={"Tarih": "Tarih ", "Ders": " Ders"})
+    icerik = ornek_xlsx(df)
+    anahtar = hashlib.sha256(icerik).hexdigest()
+
+    dogrudan = veri_yukle(icerik)
+    satis_analiz_webapp._veri_onbellegi.clear()
+    r = istemci.post("/analiz-onizleme", files={"file": ("a.xlsx", icerik)},
+                     data={"start_date": "2024-01-01", "end_date": "2024-12-31", "parca_satir": "1000"})
+    assert r.status_code == 200
+    akistan = satis_analiz_webapp.onbellekten_al(anahtar)
+
+    assert akistan.dersler == dogrudan.dersler
+    assert akistan.ders_kodlari == dogrudan.ders_kodlari
+    for alan in ("kodlar", "tarihler", "tutarlar", "ofsetler"):
+        assert np.array_equal(getattr(akistan, alan), getattr(dogrudan, alan)), alan
+
+
+def test_bosluklu_baslik_soguk_onbellekte_de_calisir(istemci, bos_onbellek):
+    df = pd.DataFrame({"Tarih ": pd.to_datetime(["2024-01-05"]), "Ders": ["A"], "Tutar": [10.0]})
+    r = istemci.post("/analiz", files={"file": ("a.xlsx", ornek_xlsx(df))},
+                     data={"start_date": "2024-01-01", "end_date": "2024-12-31"})
+    assert r.status_code == 200
+    assert r.json() == {"total": 10.0, "detaylar": [{"ders": "A", "tutar": 10.0}]}
+
+
+ARALIK = {"start_date": "2024-02-01", "end_date": "2024-10-31"}
+
+
+def onizleme_olaylari(istemci, icerik, **form):
+    r = istemci.post("/analiz-onizleme", files={"file": ("a.xlsx", icerik)}, data={**ARALIK, **form})
+    assert r.status_code == 200
+    return [json.loads(satir) for satir in r.text.splitlines() if satir.strip()]
+
+
+def test_onizleme_sonucu_analiz_ile_ayni_ve_ara_toplamlar_buyur(istemci, bos_onbellek):
+    df = ornek_cerceve(5, satir=3500)
+    df["Tutar"] = df["Tutar"].abs()
+    icerik = ornek_xlsx(df)
+
+    olaylar = onizleme_olaylari(istemci, icerik, parca_satir="1")
+    ara, sonuc = olaylar[:-1], olaylar[-1]
+    # parca_satir alt sınıra (1000) çekilir: 3500 satır -> 4 ara olay
+    assert [o["tur"] for o in olaylar] == ["onizleme"] * 4 + ["sonuc"]
+    assert [o["islenen_satir"] for o in ara] == [1000, 2000, 3000, 3500]
+    assert ara[-1]["tamamlanma"] == 100.0
+
+    for onceki, sonraki in zip(ara, ara[1:]):
+        assert sonraki["total"] >= onceki["total"]
+        onceki_adet = {anahtar(d["ders"]): d["adet"] for d in onceki["detaylar"]}
+        for d in sonraki["detaylar"]:
+            assert d["adet"] >= onceki_adet.get(anahtar(d["ders"]), 0)
+
+    # Son ara tahmin kesin sonuçla aynı dersleri aynı sırada, aynı toplamlarla verir
+    assert [d["ders"] for d in ara[-1]["detaylar"]] == [d["ders"] for d in sonuc["detaylar"]]
+    assert ara[-1]["total"] == pytest.approx(sonuc["total"], rel=1e-12)
+    assert ara[-1]["tarih_araligi"] == sonuc["tarih_araligi"]
+
+    satis_analiz_webapp._veri_onbellegi.clear()
+    analiz = istemci.post("/analiz", files={"file": ("a.xlsx", icerik)}, data=ARALIK).json()
+    assert sonuc["total"] == analiz["total"]
+    assert [{"ders": d["ders"], "tutar": d["tutar"]} for d in sonuc["detaylar"]] == analiz["detaylar"]
+
+
+def test_onizleme_eksik_sutunda_hata_olayi(istemci, bos_onbellek):
+    icerik = ornek_xlsx(pd.DataFrame({"Tarih": ["2024-01-01"], "Tutar": [1.0]}))
+    assert [o["tur"] for o in onizleme_olaylari(istemci, icerik)] == ["hata"]
+
+
+def test_onizleme_okunamayan_dosyada_hata_olayi(istemci, bos_onbellek):
+    assert [o["tur"] for o in onizleme_olaylari(istemci, b"excel degil")] == ["hata"]
+
+
+def test_onizleme_parca_hatasinda_akis_hata_olayiyla_biter(istemci, bos_onbellek, monkeypatch):
+    def bozuk(*args, **kwargs):
+        raise ValueError("bozuk")
+    monkeypatch.setattr(satis_analiz_webapp, "onizleme_ozeti", bozuk)
+    icerik = ornek_xlsx(ornek_cerceve(6, satir=100))
+    assert [o["tur"] for o in onizleme_olaylari(istemci, icerik)] == ["hata"]
+
+
+def test_onizleme_parca_parca_okunamayan_dosyada_tek_seferde_hesaplar(istemci, bos_onbellek, monkeypatch):
+    # .xls gibi openpyxl'in akışla açamadığı dosyalar pd.read_excel ile tek seferde okunur
+    def okunamaz(*args, **kwargs):
+        raise ValueError("xls")
+    monkeypatch.setattr(satis_analiz_webapp, "openpyxl", SimpleNamespace(load_workbook=okunamaz))
+    icerik = ornek_xlsx(ornek_cerceve(7, satir=500))
+
+    olaylar = onizleme_olaylari(istemci, icerik)
+    assert [o["tur"] for o in olaylar] == ["sonuc"]
+    analiz = istemci.post("/analiz", files={"file": ("a.xlsx", icerik)}, data=ARALIK).json()
+    assert olaylar[0]["total"] == analiz["total"]
@@ -0,0 +1,347 @@
+"""Satış analiz uygulaması için eşzamanlı yük testi.
+
+Yerelde bir uvicorn örneği başlatır, sahte bir istemci filosuyla gerçekçi
+istek karışımlarını (yükleme + akışlı analiz, /aylik-dokum dökümleri, ana sayfa)
+gönderir ve verim, gecikme yüzdelikleri, hata oranı ile sunucu RSS
+değerlerini raporlar. Birden fazla worker sayısı verilirse her biri için
+ölçüm yapar ve doygunluk noktasını bulur.
+
+Örnek:
+    python yuk_testi.py --workers 1,2,4 --eszamanlilik 32 --satir 20000 --sure 30
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import time
+import zipfile
+from io import BytesIO
+
+import httpx
+import numpy as np
+import pandas as pd
+import psutil
+
+UYGULAMA_DIZINI = os.path.dirname(os.path.abspath(__file__))
+DERSLER = ["Matematik", "Fizik", "Kimya", "Biyoloji", "Türkçe", "Tarih", "Tüm Dersler Paketi"]
+VARSAYILAN_KARISIM = "onizleme=2,dokum=5,ana=3"
+
+
+def ornek_calisma_kitabi(satir, tohum=0):
+    # Gerçek dosyalara benzeyen Tarih / Ders / Tutar tablosu
+    rng = np.random.default_rng(tohum)
+    df = pd.DataFrame({
+        "Tarih": pd.Timestamp("2024-01-01") + pd.to_timedelta(rng.integers(0, 365 * 24 * 60, satir), unit="min"),
+        "Ders": rng.choice(DERSLER, satir),
+        "Tutar": rng.uniform(50, 2500, satir).round(2),
+    })
+    buf = BytesIO()
+    df.to_excel(buf, index=False)
+    return buf.getvalue()
+
+
+def benzersiz_kopya(dosya, etiket):
+    # Uygulama yüklemeleri içerik özetiyle önbelleğe alır. Zip açıklamasını değiştirmek
+    # çalışma kitabını bozmadan farklı bir özet verir; böylece istek gerçekten ayrıştırılır.
+    buf = BytesIO(dosya)
+    with zipfile.ZipFile(buf, "a") as z:
+        z.comment = etiket.encode()
+    return buf.getvalue()
+
+
+def karisimi_coz(metin):
+    karisim = {}
+    for parca in metin.split(","):
+        ad, _, agirlik = parca.partition("=")
+        ad = ad.strip()
+        if ad not in SENARYOLAR:
+            raise SystemExit(f"Bilinmeyen senaryo: {ad} (seçenekler: {', '.join(SENARYOLAR)})")
+        karisim[ad] = float(agirlik or 1)
+    return karisim
+
+
+def bos_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def sunucuyu_baslat(port, workers):
+    komut = [
+        sys.executable, "-m", "uvicorn", "satis_analiz_webapp:app",
+        "--host", "127.0.0.1", "--port", str(port),
+        "--workers", str(workers), "--log-level", "warning",
+    ]
+    return subprocess.Popen(komut, cwd=UYGULAMA_DIZINI)
+
+
+async def hazir_olmasini_bekle(taban, surec, zaman_asimi=60):
+    bitis = time.monotonic() + zaman_asimi
+    async with httpx.AsyncClient(base_url=taban) as istemci:
+        while time.monotonic() < bitis:
+            if surec.poll() is not None:
+                raise RuntimeError("Sunucu başlatılamadı.")
+            try:
+                if (await istemci.get("/")).status_code == 200:
+                    return
+            except httpx.TransportError:
+                pass
+            await asyncio.sleep(0.2)
+    raise RuntimeError("Sunucu zamanında hazır olmadı.")
+
+
+def sunucuyu_durdur(surec):
+    surec.terminate()
+    try:
+        surec.wait(timeout=15)
+    except subprocess.TimeoutExpired:
+        surec.kill()
+        surec.wait()
+
+
+def toplam_rss(pid):
+    # Ana süreç + worker'lar
+    try:
+        ana = psutil.Process(pid)
+        surecler = [ana] + ana.children(recursive=True)
+    except psutil.NoSuchProcess:
+        return 0
+    toplam = 0
+    for p in surecler:
+        try:
+            toplam += p.memory_info().rss
+        except psutil.NoSuchProcess:
+            pass
+    return toplam
+
+
+async def rss_ornekle(pid, aralik, olcumler, dur):
+    baslangic = time.monotonic()
+    while not dur.is_set():
+        olcumler.append((round(time.monotonic() - baslangic, 2), toplam_rss(pid)))
+        try:
+            await asyncio.wait_for(dur.wait(), timeout=aralik)
+        except asyncio.TimeoutError:
+            pass
+
+
+# --- Senaryolar: her biri bir kullanıcı eylemini taklit eder ---
+
+def _form(ortam):
+    return {"start_date": ortam["baslangic"], "end_date": ortam["bitis"]}
+
+
+def _dosya(ortam):
+    # --onbellek-orani olasılıkla herkesin paylaştığı dosya (önbellek isabeti), aksi halde yeni bir kopya
+    if random.random() < ortam["onbellek_orani"]:
+        return ortam["dosya"]
+    ortam["sayac"] += 1
+    return benzersiz_kopya(ortam["dosya"], f"yuk-testi-{ortam['sayac']}")
+
+
+async def senaryo_ana(istemci, ortam):
+    return await istemci.get("/")
+
+
+async def senaryo_analiz(istemci, ortam):
+    return await istemci.post(
+        "/analiz",
+        files={"file": ("satis.xlsx", _dosya(ortam))},
+        data=_form(ortam),
+    )
+
+
+async def senaryo_dokum(istemci, ortam):
+    return await istemci.post(
+        "/aylik-dokum",
+        files={"file": ("satis.xlsx", _dosya(ortam))},
+        data={**_form(ortam), "ders": random.choice(DERSLER), "rate": "20"},
+    )
+
+
+async def senaryo_onizleme(istemci, ortam):
+    # Ana sayfanın kullandığı akış: NDJSON gövdesi sonuna kadar okunur
+    async with istemci.stream(
+        "POST",
+        "/analiz-onizleme",
+        files={"file": ("satis.xlsx", _dosya(ortam))},
+        data=_form(ortam),
+    ) as yanit:
+        son = None
+        async for satir in yanit.aiter_lines():
+            if satir.strip():
+                son = json.loads(satir)
+    if yanit.status_code < 400 and (son is None or son.get("tur") != "sonuc"):
+        # Akış kesildi ya da "hata" olayıyla bitti
+        return httpx.Response(status_code=599)
+    return yanit
+
+
+SENARYOLAR = {
+    "ana": senaryo_ana,
+    "analiz": senaryo_analiz,
+    "onizleme": senaryo_onizleme,
+    "dokum": senaryo_dokum,
+}
+
+
+async def istemci_dongusu(istemci, ortam, karisim, bitis, sonuclar):
+    adlar, agirliklar = list(karisim), list(karisim.values())
+    while time.monotonic() < bitis:
+        ad = random.choices(adlar, weights=agirliklar)[0]
+        t0 = time.perf_counter()
+        try:
+            yanit = await SENARYOLAR[ad](istemci, ortam)
+            basarili = yanit.status_code < 400
+        except httpx.HTTPError:
+            basarili = False
+        sonuclar.append((ad, time.perf_counter() - t0, basarili))
+
+
+def ozetle(sonuclar, sure):
+    def istatistik(kayitlar):
+        if not kayitlar:
+            return {"istek": 0}
+        gecikme = np.array([k[1] for k in kayitlar]) * 1000
+        hatalar = sum(1 for k in kayitlar if not k[2])
+        return {
+            "istek": len(kayitlar),
+            "verim_rps": round(len(kayitlar) / sure, 2),
+            "hata_orani": round(hatalar / len(kayitlar), 4),
+            "p50_ms": round(float(np.percentile(gecikme, 50)), 1),
+            "p95_ms": round(float(np.percentile(gecikme, 95)), 1),
+            "p99_ms": round(float(np.percentile(gecikme, 99)), 1),
+            "max_ms": round(float(gecikme.max()), 1),
+        }
+
+    ozet = {"genel": istatistik(sonuclar)}
+    for ad in sorted({k[0] for k in sonuclar}):
+        ozet[ad] = istatistik([k for k in sonuclar if k[0] == ad])
+    return ozet
+
+
+async def tek_olcum(workers, satir, args, karisim):
+    port = args.port or bos_port()
+    taban = f"http://127.0.0.1:{port}"
+    ortam = {
+        "dosya": ornek_calisma_kitabi(satir),
+        "baslangic": args.baslangic,
+        "bitis": args.bitis,
+        "onbellek_orani": args.onbellek_orani,
+        "sayac": 0,
+    }
+
+    surec = sunucuyu_baslat(port, workers)
+    try:
+        await hazir_olmasini_bekle(taban, surec)
+        rss, dur, sonuclar = [], asyncio.Event(), []
+        ornekleyici = asyncio.create_task(rss_ornekle(surec.pid, args.rss_aralik, rss, dur))
+
+        limitler = httpx.Limits(max_connections=args.eszamanlilik, max_keepalive_connections=args.eszamanlilik)
+        async with httpx.AsyncClient(base_url=taban, timeout=args.zaman_asimi, limits=limitler) as istemci:
+            baslangic = time.monotonic()
+            bitis = baslangic + args.sure
+            await asyncio.gather(*[
+                istemci_dongusu(istemci, ortam, karisim, bitis, sonuclar)
+                for _ in range(args.eszamanlilik)
+            ])
+            gecen = time.monotonic() - baslangic
+
+        dur.set()
+        await ornekleyici
+    finally:
+        sunucuyu_durdur(surec)
+
+    rss_mb = [(t, round(b / 2**20, 1)) for t, b in rss]
+    return {
+        "workers": workers,
+        "satir": satir,
+        "eszamanlilik": args.eszamanlilik,
+        "sure_s": round(gecen, 1),
+        "ozet": ozetle(sonuclar, gecen),
+        "rss_mb": {
+            "tepe": max((m for _, m in rss_mb), default=0),
+            "ortalama": round(sum(m for _, m in rss_mb) / len(rss_mb), 1) if rss_mb else 0,
+            "zaman_serisi": rss_mb,
+        },
+    }
+
+
+def doygunluk_noktasi(olcumler, esik):
+    # Bir sonraki worker artışı verimi %esik'ten az artırıyorsa doygunluğa ulaşılmıştır
+    for onceki, sonraki in zip(olcumler, olcumler[1:]):
+        v0 = onceki["ozet"]["genel"].get("verim_rps", 0)
+        v1 = sonraki["ozet"]["genel"].get("verim_rps", 0)
+        if v0 and (v1 - v0) / v0 < esik:
+            return onceki["workers"]
+    return None
+
+
+def satir_yaz(olcum):
+    g = olcum["ozet"]["genel"]
+    print(
+        f"workers={olcum['workers']:<3} satir={olcum['satir']:<8} "
+        f"istek={g.get('istek', 0):<6} verim={g.get('verim_rps', 0):>8.2f}/s "
+        f"p50={g.get('p50_ms', 0):>8.1f}ms p95={g.get('p95_ms', 0):>8.1f}ms "
+        f"p99={g.get('p99_ms', 0):>8.1f}ms hata={g.get('hata_orani', 0):.2%} "
+        f"rss_tepe={olcum['rss_mb']['tepe']}MB"
+    )
+    for ad, ist in olcum["ozet"].items():
+        if ad != "genel" and ist["istek"]:
+            print(
+                f"    {ad:<7} istek={ist['istek']:<6} p50={ist['p50_ms']:>8.1f}ms "
+                f"p99={ist['p99_ms']:>8.1f}ms hata={ist['hata_orani']:.2%}"
+            )
+
+
+async def ana(args):
+    karisim = karisimi_coz(args.karisim)
+    worker_listesi = sorted({int(w) for w in args.workers.split(",")})
+    satir_listesi = [int(s) for s in args.satir.split(",")]
+
+    tum_olcumler = []
+    for satir in satir_listesi:
+        olcumler = []
+        for workers in worker_listesi:
+            olcum = await tek_olcum(workers, satir, args, karisim)
+            satir_yaz(olcum)
+            olcumler.append(olcum)
+        if len(olcumler) > 1:
+            nokta = doygunluk_noktasi(olcumler, args.doygunluk_esigi)
+            if nokta is None:
+                print(f"satir={satir}: denenen worker sayılarında doygunluğa ulaşılmadı.")
+            else:
+                print(f"satir={satir}: doygunluk noktası {nokta} worker.")
+        tum_olcumler.extend(olcumler)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(tum_olcumler, f, ensure_ascii=False, indent=2)
+
+
+def arguman_ayristir(argv=None):
+    p = argparse.ArgumentParser(description="Satış analiz uygulaması yük testi")
+    p.add_argument("--workers", default="1", help="virgülle ayrılmış uvicorn worker sayıları (ör. 1,2,4)")
+    p.add_argument("--eszamanlilik", type=int, default=16, help="eşzamanlı sahte kullanıcı sayısı")
+    p.add_argument("--satir", default="10000", help="virgülle ayrılmış çalışma kitabı satır sayıları")
+    p.add_argument("--sure", type=float, default=30, help="her ölçümün süresi (sn)")
+    p.add_argument("--karisim", default=VARSAYILAN_KARISIM, help="senaryo ağırlıkları (ana, analiz, onizleme, dokum)")
+    p.add_argument("--onbellek-orani", type=float, default=0.0,
+                   help="yüklemelerin aynı dosyayı tekrar göndererek önbellekten karşılanma oranı (0-1)")
+    p.add_argument("--baslangic", default="2024-01-01", help="istek başlangıç tarihi")
+    p.add_argument("--bitis", default="2024-12-31", help="istek bitiş tarihi")
+    p.add_argument("--port", type=int, default=0, help="sunucu portu (0: boş port seç)")
+    p.add_argument("--rss-aralik", type=float, default=1.0, help="RSS örnekleme aralığı (sn)")
+    p.add_argument("--zaman-asimi", type=float, default=300, help="istek zaman aşımı (sn)")
+    p.add_argument("--doygunluk-esigi", type=float, default=0.05,
+                   help="verim artışı bu oranın altına düşünce doygunluk kabul edilir")
+    p.add_argument("--json", help="ham sonuçların yazılacağı dosya")
+    return p.parse_args(argv)
+
+
+if __name__ == "__main__":
+    asyncio.run(ana(arguman_ayristir()))